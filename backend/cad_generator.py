@@ -1,34 +1,83 @@
 """Simplified CAD Generation module for MVP"""
-from typing import Dict, Any, List, Tuple
-import json
+from typing import Dict, Any, List, NamedTuple, Tuple
 import math
 import struct
 
+import orjson
+
+class BracketParams(NamedTuple):
+    """Resolved bracket dimensions"""
+    base_length: float = 100
+    base_width: float = 80
+    height: float = 45
+
+class BoxParams(NamedTuple):
+    """Resolved box/housing dimensions"""
+    length: float = 100
+    width: float = 80
+    height: float = 50
+
+class CylinderParams(NamedTuple):
+    """Resolved cylinder dimensions"""
+    radius: float = 25
+    height: float = 50
+
+def _coerce_params(geometry_data: Dict[str, Any]) -> NamedTuple:
+    """Resolve the raw params dict into a typed tuple, applying defaults once"""
+    geom_type = geometry_data.get('type', 'box')
+    get = geometry_data.get
+
+    if geom_type == 'bracket':
+        return BracketParams(get('base_length', 100), get('base_width', 80), get('height', 45))
+    if geom_type == 'cylinder':
+        return CylinderParams(get('radius', 25), get('height', 50))
+    return BoxParams(get('length', 100), get('width', 80), get('height', 50))
+
 class SimpleWorkplane:
-    """Simplified workplane for CAD generation"""
+    """Simplified workplane for CAD generation
+
+    Geometry is treated as immutable after construction — the bounding box
+    is computed once and cached. Do not modify the geometry dict in place;
+    use mutate() so the cache is invalidated.
+    """
+    __slots__ = ('geometry', 'params', '_bbox')
+
     def __init__(self, geometry_data: Dict[str, Any]):
         self.geometry = geometry_data
-    
+        # Resolve dict lookups and defaults once; hot paths read attributes
+        self.params = _coerce_params(geometry_data)
+        self._bbox = None
+
+    def mutate(self, geometry_data: Dict[str, Any]) -> None:
+        """Replace the geometry and invalidate cached derived data"""
+        self.geometry = geometry_data
+        self.params = _coerce_params(geometry_data)
+        self._bbox = None
+
     def get_bounding_box(self) -> Dict[str, float]:
+        """Get bounding box (cached after first call)"""
+        if self._bbox is None:
+            self._bbox = self._compute_bounding_box()
+        return self._bbox
+
+    def _compute_bounding_box(self) -> Dict[str, float]:
         """Calculate bounding box"""
-        geom_type = self.geometry.get('type', 'box')
-        
-        if geom_type == 'bracket':
-            length = self.geometry.get('base_length', 100)
-            width = self.geometry.get('base_width', 80)
-            height = self.geometry.get('height', 45)
-        elif geom_type == 'cylinder':
-            radius = self.geometry.get('radius', 25)
-            height = self.geometry.get('height', 50)
-            length = radius * 2
-            width = radius * 2
+        params = self.params
+
+        if isinstance(params, CylinderParams):
+            length = width = params.radius * 2
+            height = params.height
+        elif isinstance(params, BracketParams):
+            length = params.base_length
+            width = params.base_width
+            height = params.height
         else:  # box
-            length = self.geometry.get('length', 100)
-            width = self.geometry.get('width', 80)
-            height = self.geometry.get('height', 50)
-        
+            length = params.length
+            width = params.width
+            height = params.height
+
         volume = length * width * height
-        
+
         return {
             'length': length,
             'width': width,
@@ -39,9 +88,13 @@ class SimpleWorkplane:
 class CADGenerator:
     """Generate parametric CAD models from structured parameters"""
     
+    _CACHE_MAX = 64
+
     def __init__(self):
-        pass
-    
+        # Generation is deterministic in params; memoize recent results so
+        # repeated calls (parameter sliders, re-exports) skip regeneration
+        self._cache: Dict[str, SimpleWorkplane] = {}
+
     def generate_bracket(self, params: Dict[str, Any]) -> SimpleWorkplane:
         """Generate a motor bracket"""
         return SimpleWorkplane(params)
@@ -60,75 +113,95 @@ class CADGenerator:
     
     def generate_custom(self, params: Dict[str, Any]) -> SimpleWorkplane:
         """Generate custom geometry based on type"""
+        key = orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
         geometry_type = params.get('type', 'box').lower()
-        
+
         if geometry_type == 'bracket':
-            return self.generate_bracket(params)
+            workplane = self.generate_bracket(params)
         elif geometry_type == 'box' or geometry_type == 'housing':
-            return self.generate_box(params)
+            workplane = self.generate_box(params)
         elif geometry_type == 'cylinder':
-            return self.generate_cylinder(params)
+            workplane = self.generate_cylinder(params)
         elif geometry_type == 'gear':
-            return self.generate_gear(params)
+            workplane = self.generate_gear(params)
         else:
-            return self.generate_box(params)
+            workplane = self.generate_box(params)
+
+        if len(self._cache) >= self._CACHE_MAX:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = workplane
+
+        return workplane
     
     def export_step(self, workplane: SimpleWorkplane, filepath: str) -> bool:
         """Export to STEP format (simplified)"""
         try:
-            # Write basic STEP header
-            with open(filepath, 'w') as f:
-                f.write("ISO-10303-21;\n")
-                f.write("HEADER;\n")
-                f.write("FILE_DESCRIPTION(('VibeCAD Generated Model'),'2;1');\n")
-                f.write("FILE_NAME('vibecad_model.stp','2026-01-27T00:00:00',('VibeCAD'),(''),''  ,'VibeCAD 1.0','');\n")
-                f.write("FILE_SCHEMA(('AUTOMOTIVE_DESIGN'));\n")
-                f.write("ENDSEC;\n")
-                f.write("DATA;\n")
-                f.write("/* Box geometry placeholder */\n")
-                geom = workplane.geometry
-                f.write(f"/* Type: {geom.get('type', 'box')} */\n")
-                f.write(f"/* Dimensions: {geom.get('base_length', geom.get('length', 100))} x ")
-                f.write(f"{geom.get('base_width', geom.get('width', 80))} x ")
-                f.write(f"{geom.get('height', 50)} mm */\n")
-                f.write("ENDSEC;\n")
-                f.write("END-ISO-10303-21;\n")
+            geom = workplane.geometry
+            # Build the whole file in memory and issue a single write;
+            # orjson emits bytes directly so no Python-level encoding pass
+            payload = b"".join([
+                b"ISO-10303-21;\n",
+                b"HEADER;\n",
+                b"FILE_DESCRIPTION(('VibeCAD Generated Model'),'2;1');\n",
+                b"FILE_NAME('vibecad_model.stp','2026-01-27T00:00:00',('VibeCAD'),(''),''  ,'VibeCAD 1.0','');\n",
+                b"FILE_SCHEMA(('AUTOMOTIVE_DESIGN'));\n",
+                b"ENDSEC;\n",
+                b"DATA;\n",
+                b"/* Box geometry placeholder */\n",
+                b"/* Params: " + orjson.dumps(geom, default=str) + b" */\n",
+                b"ENDSEC;\n",
+                b"END-ISO-10303-21;\n",
+            ])
+            with open(filepath, 'wb') as f:
+                f.write(payload)
             return True
         except Exception as e:
             print(f"Error exporting STEP: {e}")
             return False
     
     def export_stl(self, workplane: SimpleWorkplane, filepath: str) -> bool:
-        """Export to STL format (simplified)"""
+        """Export to STL format (binary)"""
         try:
-            geom = workplane.geometry
             bbox = workplane.get_bounding_box()
-            
-            # Create simple STL file
-            with open(filepath, 'w') as f:
-                f.write(f"solid vibecad_model\n")
-                # Simple box representation with 12 triangles
-                length = bbox['length']
-                width = bbox['width']
-                height = bbox['height']
-                
-                # Front face (2 triangles)
-                f.write(f"  facet normal 0 0 1\n")
-                f.write(f"    outer loop\n")
-                f.write(f"      vertex 0 0 0\n")
-                f.write(f"      vertex {length} 0 0\n")
-                f.write(f"      vertex {length} {width} 0\n")
-                f.write(f"    endloop\n")
-                f.write(f"  endfacet\n")
-                f.write(f"  facet normal 0 0 1\n")
-                f.write(f"    outer loop\n")
-                f.write(f"      vertex 0 0 0\n")
-                f.write(f"      vertex {length} {width} 0\n")
-                f.write(f"      vertex 0 {width} 0\n")
-                f.write(f"    endloop\n")
-                f.write(f"  endfacet\n")
-                
-                f.write(f"endsolid vibecad_model\n")
+            length = bbox['length']
+            width = bbox['width']
+            height = bbox['height']
+
+            # Simple box representation with 12 triangles
+            corners = (
+                (0, 0, 0), (length, 0, 0), (length, width, 0), (0, width, 0),
+                (0, 0, height), (length, 0, height), (length, width, height), (0, width, height),
+            )
+            # (normal, corner indices) per facet, wound counter-clockwise
+            # looking down the outward normal
+            facets = (
+                ((0, 0, -1), 0, 2, 1), ((0, 0, -1), 0, 3, 2),  # bottom
+                ((0, 0, 1), 4, 5, 6), ((0, 0, 1), 4, 6, 7),    # top
+                ((0, -1, 0), 0, 1, 5), ((0, -1, 0), 0, 5, 4),  # front
+                ((0, 1, 0), 2, 3, 7), ((0, 1, 0), 2, 7, 6),    # back
+                ((-1, 0, 0), 0, 4, 7), ((-1, 0, 0), 0, 7, 3),  # left
+                ((1, 0, 0), 1, 2, 6), ((1, 0, 0), 1, 6, 5),    # right
+            )
+
+            # Binary STL: 80-byte header, uint32 triangle count, then 50
+            # bytes per triangle. Preallocate once and pack in place so the
+            # whole file goes out in a single write.
+            n_tri = len(facets)
+            buf = bytearray(84 + n_tri * 50)
+            buf[:18] = b'VibeCAD binary STL'
+            struct.pack_into('<I', buf, 80, n_tri)
+            offset = 84
+            for normal, i0, i1, i2 in facets:
+                struct.pack_into('<12fH', buf, offset,
+                                 *normal, *corners[i0], *corners[i1], *corners[i2], 0)
+                offset += 50
+
+            with open(filepath, 'wb') as f:
+                f.write(buf)
             return True
         except Exception as e:
             print(f"Error exporting STL: {e}")
@@ -1,130 +1,197 @@
 """Standard component library for mechanical parts"""
+import types
 from typing import Dict, Any, List
 
+import numpy as np
+
+# Component tables are static reference data. Build them once at import time
+# as tuples behind a read-only mapping so every ComponentLibrary instance
+# (and any worker process forking this module) shares the same objects.
+_COMPONENTS = types.MappingProxyType({
+    'nema_motors': (
+        {
+            'name': 'NEMA11',
+            'size': 11,
+            'face_width': 28,
+            'face_height': 28,
+            'hole_spacing': 23,
+            'bolt_size': 'M2.5',
+            'hole_diameter': 2.7,
+            'shaft_diameter': 5,
+            'typical_length': 30
+        },
+        {
+            'name': 'NEMA14',
+            'size': 14,
+            'face_width': 35.2,
+            'face_height': 35.2,
+            'hole_spacing': 26,
+            'bolt_size': 'M3',
+            'hole_diameter': 3.2,
+            'shaft_diameter': 5,
+            'typical_length': 36
+        },
+        {
+            'name': 'NEMA17',
+            'size': 17,
+            'face_width': 42.3,
+            'face_height': 42.3,
+            'hole_spacing': 31,
+            'bolt_size': 'M3',
+            'hole_diameter': 3.2,
+            'shaft_diameter': 5,
+            'typical_length': 47
+        },
+        {
+            'name': 'NEMA23',
+            'size': 23,
+            'face_width': 56.4,
+            'face_height': 56.4,
+            'hole_spacing': 47.14,
+            'bolt_size': 'M4',
+            'hole_diameter': 4.5,
+            'shaft_diameter': 6.35,
+            'typical_length': 76
+        },
+        {
+            'name': 'NEMA34',
+            'size': 34,
+            'face_width': 86,
+            'face_height': 86,
+            'hole_spacing': 69.6,
+            'bolt_size': 'M6',
+            'hole_diameter': 6.6,
+            'shaft_diameter': 14,
+            'typical_length': 98
+        }
+    ),
+    'metric_bolts': (
+        {'name': 'M3', 'diameter': 3.0, 'clearance_hole': 3.2, 'close_fit': 3.1, 'thread_pitch': 0.5},
+        {'name': 'M4', 'diameter': 4.0, 'clearance_hole': 4.5, 'close_fit': 4.2, 'thread_pitch': 0.7},
+        {'name': 'M5', 'diameter': 5.0, 'clearance_hole': 5.5, 'close_fit': 5.2, 'thread_pitch': 0.8},
+        {'name': 'M6', 'diameter': 6.0, 'clearance_hole': 6.6, 'close_fit': 6.2, 'thread_pitch': 1.0},
+        {'name': 'M8', 'diameter': 8.0, 'clearance_hole': 9.0, 'close_fit': 8.4, 'thread_pitch': 1.25},
+        {'name': 'M10', 'diameter': 10.0, 'clearance_hole': 11.0, 'close_fit': 10.5, 'thread_pitch': 1.5},
+        {'name': 'M12', 'diameter': 12.0, 'clearance_hole': 13.5, 'close_fit': 12.6, 'thread_pitch': 1.75},
+    ),
+    'bearings': (
+        {'name': '608', 'type': 'deep_groove', 'inner_diameter': 8, 'outer_diameter': 22, 'width': 7, 'load_rating': 3600},
+        {'name': '6000', 'type': 'deep_groove', 'inner_diameter': 10, 'outer_diameter': 26, 'width': 8, 'load_rating': 4500},
+        {'name': '6001', 'type': 'deep_groove', 'inner_diameter': 12, 'outer_diameter': 28, 'width': 8, 'load_rating': 5000},
+        {'name': '6002', 'type': 'deep_groove', 'inner_diameter': 15, 'outer_diameter': 32, 'width': 9, 'load_rating': 5600},
+        {'name': '6003', 'type': 'deep_groove', 'inner_diameter': 17, 'outer_diameter': 35, 'width': 10, 'load_rating': 6200},
+        {'name': '6004', 'type': 'deep_groove', 'inner_diameter': 20, 'outer_diameter': 42, 'width': 12, 'load_rating': 9500},
+        {'name': '6005', 'type': 'deep_groove', 'inner_diameter': 25, 'outer_diameter': 47, 'width': 12, 'load_rating': 10200},
+        {'name': '6006', 'type': 'deep_groove', 'inner_diameter': 30, 'outer_diameter': 55, 'width': 13, 'load_rating': 11800},
+    ),
+    'connectors': (
+        {'name': 'USB-A', 'width': 12, 'height': 4.5, 'depth': 14, 'type': 'usb'},
+        {'name': 'USB-C', 'width': 8.4, 'height': 2.6, 'depth': 7.3, 'type': 'usb'},
+        {'name': 'USB-Micro', 'width': 6.85, 'height': 1.8, 'depth': 7.5, 'type': 'usb'},
+        {'name': 'DB9', 'width': 30.8, 'height': 12.5, 'pins': 9, 'type': 'd_sub'},
+        {'name': 'DB25', 'width': 47.8, 'height': 12.5, 'pins': 25, 'type': 'd_sub'},
+    )
+})
+
+# Struct-of-arrays view of the bearing table: numeric selection runs as
+# vectorized comparisons instead of walking dicts field by field
+_BEARING_DTYPE = np.dtype([
+    ('name', 'U8'),
+    ('inner_diameter', 'f4'),
+    ('outer_diameter', 'f4'),
+    ('width', 'f4'),
+    ('load_rating', 'i4'),
+])
+_BEARINGS_NP = np.array(
+    [(c['name'], c['inner_diameter'], c['outer_diameter'], c['width'], c['load_rating'])
+     for c in _COMPONENTS['bearings']],
+    dtype=_BEARING_DTYPE)
+
 class ComponentLibrary:
     """Library of standard mechanical components"""
-    
+
     def __init__(self):
         self.components = self._load_components()
-    
+        # Normalized lookup indices built once; component data is static
+        self._by_name = {
+            cat: {c['name'].upper(): c for c in comps}
+            for cat, comps in self.components.items()
+        }
+        self._name_lower = {
+            cat: [(c['name'].lower(), c) for c in comps]
+            for cat, comps in self.components.items()
+        }
+        # Bigram index over lowercase names: every 2-char substring of a
+        # name maps to the entries containing it, so a query only scans the
+        # short candidate list for its leading bigram instead of the whole
+        # catalog. Substring-match semantics are unchanged.
+        self._bigram_index = {}
+        for cat, pairs in self._name_lower.items():
+            for name_lower, component in pairs:
+                seen = set()
+                for i in range(len(name_lower) - 1):
+                    gram = name_lower[i:i + 2]
+                    if gram not in seen:
+                        seen.add(gram)
+                        self._bigram_index.setdefault(gram, []).append(
+                            (name_lower, cat, component))
+
     def _load_components(self) -> Dict[str, List[Dict[str, Any]]]:
         """Load standard component specifications"""
-        return {
-            'nema_motors': [
-                {
-                    'name': 'NEMA11',
-                    'size': 11,
-                    'face_width': 28,
-                    'face_height': 28,
-                    'hole_spacing': 23,
-                    'bolt_size': 'M2.5',
-                    'hole_diameter': 2.7,
-                    'shaft_diameter': 5,
-                    'typical_length': 30
-                },
-                {
-                    'name': 'NEMA14',
-                    'size': 14,
-                    'face_width': 35.2,
-                    'face_height': 35.2,
-                    'hole_spacing': 26,
-                    'bolt_size': 'M3',
-                    'hole_diameter': 3.2,
-                    'shaft_diameter': 5,
-                    'typical_length': 36
-                },
-                {
-                    'name': 'NEMA17',
-                    'size': 17,
-                    'face_width': 42.3,
-                    'face_height': 42.3,
-                    'hole_spacing': 31,
-                    'bolt_size': 'M3',
-                    'hole_diameter': 3.2,
-                    'shaft_diameter': 5,
-                    'typical_length': 47
-                },
-                {
-                    'name': 'NEMA23',
-                    'size': 23,
-                    'face_width': 56.4,
-                    'face_height': 56.4,
-                    'hole_spacing': 47.14,
-                    'bolt_size': 'M4',
-                    'hole_diameter': 4.5,
-                    'shaft_diameter': 6.35,
-                    'typical_length': 76
-                },
-                {
-                    'name': 'NEMA34',
-                    'size': 34,
-                    'face_width': 86,
-                    'face_height': 86,
-                    'hole_spacing': 69.6,
-                    'bolt_size': 'M6',
-                    'hole_diameter': 6.6,
-                    'shaft_diameter': 14,
-                    'typical_length': 98
-                }
-            ],
-            'metric_bolts': [
-                {'name': 'M3', 'diameter': 3.0, 'clearance_hole': 3.2, 'close_fit': 3.1, 'thread_pitch': 0.5},
-                {'name': 'M4', 'diameter': 4.0, 'clearance_hole': 4.5, 'close_fit': 4.2, 'thread_pitch': 0.7},
-                {'name': 'M5', 'diameter': 5.0, 'clearance_hole': 5.5, 'close_fit': 5.2, 'thread_pitch': 0.8},
-                {'name': 'M6', 'diameter': 6.0, 'clearance_hole': 6.6, 'close_fit': 6.2, 'thread_pitch': 1.0},
-                {'name': 'M8', 'diameter': 8.0, 'clearance_hole': 9.0, 'close_fit': 8.4, 'thread_pitch': 1.25},
-                {'name': 'M10', 'diameter': 10.0, 'clearance_hole': 11.0, 'close_fit': 10.5, 'thread_pitch': 1.5},
-                {'name': 'M12', 'diameter': 12.0, 'clearance_hole': 13.5, 'close_fit': 12.6, 'thread_pitch': 1.75},
-            ],
-            'bearings': [
-                {'name': '608', 'type': 'deep_groove', 'inner_diameter': 8, 'outer_diameter': 22, 'width': 7, 'load_rating': 3600},
-                {'name': '6000', 'type': 'deep_groove', 'inner_diameter': 10, 'outer_diameter': 26, 'width': 8, 'load_rating': 4500},
-                {'name': '6001', 'type': 'deep_groove', 'inner_diameter': 12, 'outer_diameter': 28, 'width': 8, 'load_rating': 5000},
-                {'name': '6002', 'type': 'deep_groove', 'inner_diameter': 15, 'outer_diameter': 32, 'width': 9, 'load_rating': 5600},
-                {'name': '6003', 'type': 'deep_groove', 'inner_diameter': 17, 'outer_diameter': 35, 'width': 10, 'load_rating': 6200},
-                {'name': '6004', 'type': 'deep_groove', 'inner_diameter': 20, 'outer_diameter': 42, 'width': 12, 'load_rating': 9500},
-                {'name': '6005', 'type': 'deep_groove', 'inner_diameter': 25, 'outer_diameter': 47, 'width': 12, 'load_rating': 10200},
-                {'name': '6006', 'type': 'deep_groove', 'inner_diameter': 30, 'outer_diameter': 55, 'width': 13, 'load_rating': 11800},
-            ],
-            'connectors': [
-                {'name': 'USB-A', 'width': 12, 'height': 4.5, 'depth': 14, 'type': 'usb'},
-                {'name': 'USB-C', 'width': 8.4, 'height': 2.6, 'depth': 7.3, 'type': 'usb'},
-                {'name': 'USB-Micro', 'width': 6.85, 'height': 1.8, 'depth': 7.5, 'type': 'usb'},
-                {'name': 'DB9', 'width': 30.8, 'height': 12.5, 'pins': 9, 'type': 'd_sub'},
-                {'name': 'DB25', 'width': 47.8, 'height': 12.5, 'pins': 25, 'type': 'd_sub'},
-            ]
-        }
-    
+        return _COMPONENTS
+
     def search(self, query: str, category: str = None) -> List[Dict[str, Any]]:
         """Search for components"""
         results = []
         query_lower = query.lower()
-        
-        categories_to_search = [category] if category else self.components.keys()
-        
+
+        if category is None and len(query_lower) >= 2:
+            candidates = self._bigram_index.get(query_lower[:2], ())
+            for name_lower, cat, component in candidates:
+                if query_lower in name_lower:
+                    results.append({
+                        'category': cat,
+                        **component
+                    })
+            return results
+
+        categories_to_search = [category] if category else self._name_lower.keys()
+
         for cat in categories_to_search:
-            if cat in self.components:
-                for component in self.components[cat]:
-                    if query_lower in component['name'].lower():
-                        results.append({
-                            'category': cat,
-                            **component
-                        })
-        
+            for name_lower, component in self._name_lower.get(cat, []):
+                if query_lower in name_lower:
+                    results.append({
+                        'category': cat,
+                        **component
+                    })
+
         return results
-    
+
     def get_component(self, category: str, name: str) -> Dict[str, Any]:
         """Get specific component by category and name"""
-        if category in self.components:
-            for component in self.components[category]:
-                if component['name'].upper() == name.upper():
-                    return component
-        return None
-    
+        return self._by_name.get(category, {}).get(name.upper())
+
+    def filter_bearings(self, min_inner_diameter: float = None,
+                        max_outer_diameter: float = None,
+                        min_load_rating: float = None) -> List[Dict[str, Any]]:
+        """Filter bearings by numeric criteria (vectorized over the table)"""
+        arr = _BEARINGS_NP
+        mask = np.ones(len(arr), dtype=bool)
+        if min_inner_diameter is not None:
+            mask &= arr['inner_diameter'] >= min_inner_diameter
+        if max_outer_diameter is not None:
+            mask &= arr['outer_diameter'] <= max_outer_diameter
+        if min_load_rating is not None:
+            mask &= arr['load_rating'] >= min_load_rating
+
+        # Map matches back to the canonical dict records for callers
+        names = set(arr['name'][mask])
+        return [c for c in self.components['bearings'] if c['name'] in names]
+
     def get_all_categories(self) -> List[str]:
         """Get all component categories"""
         return list(self.components.keys())
-    
+
     def get_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all components in a category"""
-        return self.components.get(category, [])
+        return list(self.components.get(category, ()))
@@ -1,63 +1,143 @@
 """Design for Manufacturing (DFM) validation engine"""
-from typing import Dict, Any, List
+import types
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Tuple
 import math
 
+import numpy as np
+
+# Raw rule tables by material and process
+_DFM_RULES = {
+    'aluminum_6061_t6': {
+        'cnc_milling': {
+            'min_wall_thickness': 1.5,
+            'recommended_wall_thickness': [2.0, 3.0],
+            'max_wall_thickness': 8.0,
+            'min_radius': 0.5,
+            'recommended_radius': [1.5, 2.0],
+            'min_hole_diameter': 3.0,
+            'min_hole_spacing': 5.0,
+            'min_edge_distance': 3.0,  # 3x hole diameter
+            'max_hole_depth_ratio': 5.0  # depth/diameter
+        }
+    },
+    'steel_mild': {
+        'cnc_milling': {
+            'min_wall_thickness': 1.0,
+            'recommended_wall_thickness': [1.5, 2.5],
+            'max_wall_thickness': 10.0,
+            'min_radius': 0.5,
+            'recommended_radius': [1.0, 2.0],
+            'min_hole_diameter': 2.5,
+            'min_hole_spacing': 5.0,
+            'min_edge_distance': 3.0
+        }
+    },
+    'plastic_abs': {
+        '3d_printing': {
+            'min_wall_thickness': 0.8,
+            'recommended_wall_thickness': [1.2, 2.0],
+            'max_overhang_angle': 45,
+            'min_radius': 0.3,
+            'recommended_infill': [15, 20],
+            'layer_height': 0.2
+        }
+    },
+    'stainless_304': {
+        'cnc_milling': {
+            'min_wall_thickness': 1.0,
+            'recommended_wall_thickness': [1.5, 3.0],
+            'min_radius': 0.8,
+            'recommended_radius': [1.5, 2.5],
+            'min_hole_diameter': 3.0,
+            'hardness_note': 'Harder to machine, recommend slower feeds'
+        }
+    }
+}
+
+@dataclass(frozen=True, slots=True)
+class ProcessRules:
+    """Flat, fully-resolved DFM limits for one (material, process) pair
+
+    Defaults match the fallbacks validate() previously applied per lookup,
+    so rule tables that omit a limit behave exactly as before.
+    """
+    min_wall_thickness: float = 1.0
+    max_wall_thickness: float = 10.0
+    recommended_wall_thickness: Tuple[float, float] = (2.0, 3.0)
+    min_hole_diameter: float = 3.0
+    min_hole_spacing: float = 5.0
+    min_edge_distance: float = 3.0  # multiplier on hole diameter
+
+_RULE_FIELDS = {f.name for f in fields(ProcessRules)}
+
+# Below this count the dense pairwise check is cheaper than building
+# grid buckets; above it the bucket walk wins
+_SPACING_BRUTE_FORCE_MAX = 32
+
+def _close_pairs(P: np.ndarray, min_spacing: float) -> List[Tuple[int, int, float]]:
+    """Index pairs (i < j) closer than min_spacing, with their distances
+
+    Small point sets take the dense broadcast path. Larger ones are
+    bucketed into a uniform grid with min_spacing-sized cells, so each
+    point is only compared against its own and neighbouring cells; for
+    typical hole patterns that keeps the check near O(N) instead of the
+    O(N^2) full pairwise matrix.
+    """
+    n = len(P)
+    min_spacing_sq = min_spacing * min_spacing
+    pairs = []
+
+    if n < _SPACING_BRUTE_FORCE_MAX:
+        diff = P[:, None, :] - P[None, :, :]
+        distances_sq = (diff ** 2).sum(-1)
+        iu, ju = np.triu_indices(n, k=1)
+        close = distances_sq[iu, ju] < min_spacing_sq
+        for k in np.flatnonzero(close):
+            i, j = int(iu[k]), int(ju[k])
+            pairs.append((i, j, math.sqrt(distances_sq[i, j])))
+        return pairs
+
+    cx = np.floor(P[:, 0] / min_spacing).astype(np.int64)
+    cy = np.floor(P[:, 1] / min_spacing).astype(np.int64)
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i in range(n):
+        cells.setdefault((int(cx[i]), int(cy[i])), []).append(i)
+
+    # Each unordered cell pair is visited exactly once via a half
+    # neighbourhood; points within a cell are compared with j > i
+    for (gx, gy), members in cells.items():
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1), (1, -1)):
+            other = members if dx == 0 and dy == 0 else cells.get((gx + dx, gy + dy))
+            if other is None:
+                continue
+            for a, i in enumerate(members):
+                xi, yi = P[i, 0], P[i, 1]
+                for j in (other[a + 1:] if other is members else other):
+                    d_sq = (xi - P[j, 0]) ** 2 + (yi - P[j, 1]) ** 2
+                    if d_sq < min_spacing_sq:
+                        pairs.append((min(i, j), max(i, j), math.sqrt(d_sq)))
+    pairs.sort()
+    return pairs
+
+# Compiled once at import: validate() resolves one record and reads
+# attributes instead of chaining dict.get calls with inline defaults
+_RULES: Dict[Tuple[str, str], ProcessRules] = {
+    (material, process): ProcessRules(**{
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in rules.items() if key in _RULE_FIELDS
+    })
+    for material, processes in _DFM_RULES.items()
+    for process, rules in processes.items()
+}
+
 class DFMValidator:
     """Validate designs against manufacturing rules"""
-    
-    def __init__(self):
-        self.rules = self._load_rules()
-    
-    def _load_rules(self) -> Dict[str, Any]:
-        """Load DFM rules for different materials and processes"""
-        return {
-            'aluminum_6061_t6': {
-                'cnc_milling': {
-                    'min_wall_thickness': 1.5,
-                    'recommended_wall_thickness': [2.0, 3.0],
-                    'max_wall_thickness': 8.0,
-                    'min_radius': 0.5,
-                    'recommended_radius': [1.5, 2.0],
-                    'min_hole_diameter': 3.0,
-                    'min_hole_spacing': 5.0,
-                    'min_edge_distance': 3.0,  # 3x hole diameter
-                    'max_hole_depth_ratio': 5.0  # depth/diameter
-                }
-            },
-            'steel_mild': {
-                'cnc_milling': {
-                    'min_wall_thickness': 1.0,
-                    'recommended_wall_thickness': [1.5, 2.5],
-                    'max_wall_thickness': 10.0,
-                    'min_radius': 0.5,
-                    'recommended_radius': [1.0, 2.0],
-                    'min_hole_diameter': 2.5,
-                    'min_hole_spacing': 5.0,
-                    'min_edge_distance': 3.0
-                }
-            },
-            'plastic_abs': {
-                '3d_printing': {
-                    'min_wall_thickness': 0.8,
-                    'recommended_wall_thickness': [1.2, 2.0],
-                    'max_overhang_angle': 45,
-                    'min_radius': 0.3,
-                    'recommended_infill': [15, 20],
-                    'layer_height': 0.2
-                }
-            },
-            'stainless_304': {
-                'cnc_milling': {
-                    'min_wall_thickness': 1.0,
-                    'recommended_wall_thickness': [1.5, 3.0],
-                    'min_radius': 0.8,
-                    'recommended_radius': [1.5, 2.5],
-                    'min_hole_diameter': 3.0,
-                    'hardness_note': 'Harder to machine, recommend slower feeds'
-                }
-            }
-        }
-    
+
+    # Rules are immutable constants shared by every validator instance;
+    # the read-only view guards against accidental in-place edits
+    rules = types.MappingProxyType(_DFM_RULES)
+
     def validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Validate design parameters against DFM rules"""
         material = params.get('material', 'aluminum_6061_t6')
@@ -67,11 +147,10 @@ class DFMValidator:
         warnings = []
         suggestions = []
         
-        # Get applicable rules
-        material_rules = self.rules.get(material, {})
-        process_rules = material_rules.get(process, {})
-        
-        if not process_rules:
+        # Get applicable rules (compiled record, attribute access only)
+        rules = _RULES.get((material, process))
+
+        if rules is None:
             warnings.append(f"No DFM rules found for {material} + {process}")
             return {
                 'valid': True,
@@ -85,9 +164,9 @@ class DFMValidator:
         geometry = params.get('primary_geometry', {})
         wall_thickness = geometry.get('wall_thickness', 2.0)
         
-        min_wall = process_rules.get('min_wall_thickness', 1.0)
-        max_wall = process_rules.get('max_wall_thickness', 10.0)
-        recommended_wall = process_rules.get('recommended_wall_thickness', [2.0, 3.0])
+        min_wall = rules.min_wall_thickness
+        max_wall = rules.max_wall_thickness
+        recommended_wall = rules.recommended_wall_thickness
         
         if wall_thickness < min_wall:
             issues.append({
@@ -116,7 +195,7 @@ class DFMValidator:
             hole_diameter = hole_params.get('hole_diameter', 4.5)
             positions = hole_params.get('positions', [])
             
-            min_hole = process_rules.get('min_hole_diameter', 3.0)
+            min_hole = rules.min_hole_diameter
             if hole_diameter < min_hole:
                 issues.append({
                     'type': 'hole_diameter',
@@ -125,38 +204,48 @@ class DFMValidator:
                     'recommendation': f"Increase hole diameter to at least {min_hole}mm"
                 })
             
-            # Check hole spacing
-            min_spacing = process_rules.get('min_hole_spacing', 5.0)
-            for i, pos1 in enumerate(positions):
-                for pos2 in positions[i+1:]:
-                    distance = math.sqrt((pos1[0]-pos2[0])**2 + (pos1[1]-pos2[1])**2)
-                    if distance < min_spacing:
-                        warnings.append({
-                            'type': 'hole_spacing',
-                            'severity': 'warning',
-                            'message': f"Holes at {pos1} and {pos2} are only {distance:.1f}mm apart (min {min_spacing}mm)",
-                            'recommendation': f"Increase spacing to at least {min_spacing}mm"
-                        })
-            
-            # Check edge distance
-            min_edge = process_rules.get('min_edge_distance', 3.0) * hole_diameter
-            base_length = geometry.get('base_length', 100)
-            base_width = geometry.get('base_width', 80)
-            
-            for pos in positions:
-                x, y = pos
-                if x < min_edge or x > base_length - min_edge:
-                    warnings.append({
-                        'type': 'edge_distance',
-                        'severity': 'warning',
-                        'message': f"Hole at {pos} is too close to edge (min {min_edge:.1f}mm)"
-                    })
-                if y < min_edge or y > base_width - min_edge:
+            P = np.asarray(positions, dtype=np.float64) if positions else None
+
+            # Check hole spacing: only the offending pairs come back from
+            # _close_pairs (dense broadcast for small patterns, grid
+            # buckets for large ones), each with its distance
+            min_spacing = rules.min_hole_spacing
+            if len(positions) >= 2:
+                for i, j, distance in _close_pairs(P, min_spacing):
+                    pos1, pos2 = positions[i], positions[j]
                     warnings.append({
-                        'type': 'edge_distance',
+                        'type': 'hole_spacing',
                         'severity': 'warning',
-                        'message': f"Hole at {pos} is too close to edge (min {min_edge:.1f}mm)"
+                        'message': f"Holes at {pos1} and {pos2} are only {distance:.1f}mm apart (min {min_spacing}mm)",
+                        'recommendation': f"Increase spacing to at least {min_spacing}mm"
                     })
+            
+            # Check edge distance: both axes as vectorized masks over the
+            # same position array, warnings emitted per violation only
+            min_edge = rules.min_edge_distance * hole_diameter
+            base_length = geometry.get('base_length', 100)
+            base_width = geometry.get('base_width', 80)
+
+            if P is not None:
+                x_lo = y_lo = min_edge
+                x_hi = base_length - min_edge
+                y_hi = base_width - min_edge
+                vx = (P[:, 0] < x_lo) | (P[:, 0] > x_hi)
+                vy = (P[:, 1] < y_lo) | (P[:, 1] > y_hi)
+                for i in np.flatnonzero(vx | vy):
+                    pos = positions[i]
+                    if vx[i]:
+                        warnings.append({
+                            'type': 'edge_distance',
+                            'severity': 'warning',
+                            'message': f"Hole at {pos} is too close to edge (min {min_edge:.1f}mm)"
+                        })
+                    if vy[i]:
+                        warnings.append({
+                            'type': 'edge_distance',
+                            'severity': 'warning',
+                            'message': f"Hole at {pos} is too close to edge (min {min_edge:.1f}mm)"
+                        })
         
         # Calculate confidence score
         confidence = 1.0
@@ -1,8 +1,13 @@
 """LLM-based natural language parser for CAD generation"""
 from emergentintegrations.llm.chat import LlmChat, UserMessage
+import copy
+import hashlib
 import json
 import os
+import re
 from typing import Dict, Any
+
+import orjson
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -12,8 +17,22 @@ load_dotenv(ROOT_DIR / '.env')
 class NLPtoCADParser:
     """Parse natural language descriptions into CAD parameters"""
     
+    _CACHE_MAX = 512
+
+    # Fallback keyword detection: one compiled scan instead of sequential
+    # substring passes over the description
+    _KW_RE = re.compile(r'\b(bracket|cylinder|tube|gear)\b', re.I)
+    _KW_TYPES = {'bracket': 'bracket', 'cylinder': 'cylinder', 'tube': 'cylinder', 'gear': 'gear'}
+
+    # Fenced JSON body in an LLM response; handles responses with
+    # surrounding prose or multiple fences without throwaway list builds
+    _FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.S)
+
     def __init__(self):
         self.api_key = os.environ.get('EMERGENT_LLM_KEY')
+        # Successful parses keyed by description: identical prompts skip
+        # the LLM round-trip entirely (seconds -> microseconds)
+        self._cache: Dict[str, Dict[str, Any]] = {}
         self.system_message = """You are a mechanical design expert AI that converts natural language descriptions into structured CAD parameters.
 
 Your task is to parse mechanical part descriptions and output ONLY valid JSON with no additional text or explanation.
@@ -65,10 +84,18 @@ Important rules:
     
     async def parse(self, description: str) -> Dict[str, Any]:
         """Parse natural language into CAD parameters"""
+        cached = self._cache.get(description)
+        if cached is not None:
+            # Callers may mutate the result, so hand out a copy
+            return copy.deepcopy(cached)
+
         try:
+            # Python's hash() is randomized per process, so it cannot key
+            # anything across restarts; BLAKE2b gives a stable session id
+            session_hash = hashlib.blake2b(description.encode(), digest_size=8).hexdigest()
             chat = LlmChat(
                 api_key=self.api_key,
-                session_id=f"cad_parse_{hash(description)}",
+                session_id=f"cad_parse_{session_hash}",
                 system_message=self.system_message
             ).with_model("anthropic", "claude-sonnet-4-5-20250929")
             
@@ -77,17 +104,23 @@ Important rules:
             
             # Extract JSON from response
             response_text = response.strip()
-            
-            # Try to find JSON in response
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
-            
+
+            # Try to find fenced JSON in response
+            match = self._FENCE_RE.search(response_text)
+            if match:
+                response_text = match.group(1)
+
             # Parse JSON
-            params = json.loads(response_text)
+            params = orjson.loads(response_text)
+
+            # Only successful parses are cached; LLM failures may be
+            # transient and should be retried
+            if len(self._cache) >= self._CACHE_MAX:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[description] = copy.deepcopy(params)
+
             return params
-            
+
         except json.JSONDecodeError as e:
             # Fallback to basic parameters
             print(f"JSON parse error: {e}")
@@ -99,16 +132,9 @@ Important rules:
     def _get_default_params(self, description: str) -> Dict[str, Any]:
         """Generate default parameters when LLM fails"""
         # Simple keyword detection
-        desc_lower = description.lower()
-        
-        part_type = 'box'
-        if 'bracket' in desc_lower:
-            part_type = 'bracket'
-        elif 'cylinder' in desc_lower or 'tube' in desc_lower:
-            part_type = 'cylinder'
-        elif 'gear' in desc_lower:
-            part_type = 'gear'
-        
+        match = self._KW_RE.search(description)
+        part_type = self._KW_TYPES[match.group(1).lower()] if match else 'box'
+
         return {
             "primary_geometry": {
                 "type": part_type,
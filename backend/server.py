@@ -1,17 +1,22 @@
 from fastapi import FastAPI, APIRouter, HTTPException, File, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import hashlib
 import os
 import logging
+from collections import defaultdict
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone
 import tempfile
-import json
+import time
+
+import orjson
 
 # Import our custom modules
 from cad_generator import CADGenerator
@@ -35,8 +40,10 @@ dfm_validator = DFMValidator()
 cost_estimator = CostEstimator()
 component_lib = ComponentLibrary()
 
-# Create the main app without a prefix
-app = FastAPI(title="VibeCAD API", version="1.0.0")
+# Create the main app without a prefix; orjson serializes responses
+# (datetimes included) several times faster than the stdlib encoder
+app = FastAPI(title="VibeCAD API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -50,6 +57,23 @@ logger = logging.getLogger(__name__)
 
 # ===== DATA MODELS =====
 
+def _uuid7() -> str:
+    """Time-ordered UUIDv7 (RFC 9562) as a string
+
+    The leading 48 bits are a millisecond timestamp, so new ids insert
+    append-mostly into the unique id index instead of at random B-tree
+    positions like uuid4. The stdlib grows uuid7 in 3.14; this is the
+    same layout built by hand.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')  # 80 random bits
+    value = ((ts_ms & ((1 << 48) - 1)) << 80
+             | 0x7 << 76                 # version 7
+             | (rand >> 68) << 64        # 12 bits rand_a
+             | 0x2 << 62                 # RFC 4122 variant
+             | rand & ((1 << 62) - 1))   # 62 bits rand_b
+    return str(uuid.UUID(int=value))
+
 class DesignRequest(BaseModel):
     description: str
     user_id: Optional[str] = None
@@ -57,7 +81,7 @@ class DesignRequest(BaseModel):
 class Design(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uuid7)
     user_id: Optional[str] = None
     description: str
     parameters: Dict[str, Any]
@@ -68,6 +92,17 @@ class Design(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: str = "draft"  # draft, validated, exported
 
+class DesignSummary(BaseModel):
+    """Lightweight design view for list endpoints — no parameter trees"""
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    user_id: Optional[str] = None
+    description: str
+    status: str = "draft"
+    created_at: datetime
+    updated_at: datetime
+
 class ParametricEditRequest(BaseModel):
     edit_description: str
 
@@ -83,6 +118,39 @@ class ComponentSearchRequest(BaseModel):
     query: str
     category: Optional[str] = None
 
+# Per-content-hash locks so concurrent exports of the same design don't
+# race to regenerate the same file
+_export_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Short-lived document cache: bursty UI flows (validate, cost, export in
+# quick succession) re-fetch the same design several times a second, so
+# hold each fetched document briefly and drop it on any write
+_DESIGN_CACHE_TTL = 5.0
+_DESIGN_CACHE_MAX = 1024
+_design_cache: Dict[str, Any] = {}
+
+async def _load_design(design_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a design document, serving repeat reads from the TTL cache"""
+    entry = _design_cache.get(design_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    design = await db.designs.find_one({"id": design_id}, {"_id": 0})
+    if design is not None:
+        if len(_design_cache) >= _DESIGN_CACHE_MAX:
+            _design_cache.pop(next(iter(_design_cache)))
+        _design_cache[design_id] = (time.monotonic() + _DESIGN_CACHE_TTL, design)
+    return design
+
+class ExportFileResponse(FileResponse):
+    """FileResponse with 1 MiB chunks for large STEP/STL downloads
+
+    Starlette's default 64 KiB chunk size means 16x the reads and sends
+    per file; the constructor does not expose chunk_size, so override the
+    class attribute.
+    """
+    chunk_size = 1024 * 1024
+
 # ===== API ENDPOINTS =====
 
 @api_router.get("/")
@@ -99,7 +167,7 @@ async def root():
         ]
     }
 
-@api_router.post("/design/generate", response_model=Design)
+@api_router.post("/design/generate")
 async def generate_design(request: DesignRequest):
     """Generate CAD design from natural language description"""
     try:
@@ -107,11 +175,15 @@ async def generate_design(request: DesignRequest):
         
         # Parse natural language to CAD parameters
         params = await nlp_parser.parse(request.description)
-        logger.info(f"Parsed parameters: {json.dumps(params, indent=2)}")
+        # Serializing the whole parameter tree is wasted work unless debug
+        # logging is actually on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsed parameters: %s", orjson.dumps(params).decode())
         
-        # Generate CAD model
+        # Generate CAD model off the event loop — geometry generation is
+        # CPU-bound and would stall every other request
         geometry_type = params.get('primary_geometry', {}).get('type', 'box')
-        workplane = cad_gen.generate_custom(params.get('primary_geometry', {}))
+        workplane = await asyncio.to_thread(cad_gen.generate_custom, params.get('primary_geometry', {}))
         
         # Get bounding box
         bounding_box = cad_gen.get_bounding_box(workplane)
@@ -133,16 +205,15 @@ async def generate_design(request: DesignRequest):
             status="validated" if dfm_result.get('valid', False) else "draft"
         )
         
-        # Save to database
-        design_dict = design.model_dump()
-        design_dict['created_at'] = design_dict['created_at'].isoformat()
-        design_dict['updated_at'] = design_dict['updated_at'].isoformat()
-        
-        await db.designs.insert_one(design_dict)
-        
+        # Save to database; BSON stores datetimes natively, no ISO round-trip.
+        # insert_one mutates its dict (adds _id), so the response gets its
+        # own JSON-mode dump — the model is serialized exactly twice, once
+        # per consumer, with no response_model re-validation pass on top.
+        await db.designs.insert_one(design.model_dump())
+
         logger.info(f"Design created with ID: {design.id}")
-        
-        return design
+
+        return ORJSONResponse(design.model_dump(mode='json'))
         
     except Exception as e:
         logger.error(f"Error generating design: {str(e)}")
@@ -156,11 +227,7 @@ async def get_design(design_id: str):
         
         if not design:
             raise HTTPException(status_code=404, detail="Design not found")
-        
-        # Convert ISO strings back to datetime
-        design['created_at'] = datetime.fromisoformat(design['created_at'])
-        design['updated_at'] = datetime.fromisoformat(design['updated_at'])
-        
+
         return Design(**design)
         
     except HTTPException:
@@ -169,18 +236,22 @@ async def get_design(design_id: str):
         logger.error(f"Error fetching design: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/designs", response_model=List[Design])
+@api_router.get("/designs", response_model=List[DesignSummary])
 async def list_designs(user_id: Optional[str] = None, limit: int = 50):
-    """List all designs"""
+    """List all designs (summary fields only)"""
     try:
         query = {"user_id": user_id} if user_id else {}
-        designs = await db.designs.find(query, {"_id": 0}).limit(limit).to_list(limit)
-        
-        for design in designs:
-            design['created_at'] = datetime.fromisoformat(design['created_at'])
-            design['updated_at'] = datetime.fromisoformat(design['updated_at'])
-        
-        return [Design(**d) for d in designs]
+        # Project away the heavy parameters/validation/cost subtrees and
+        # fetch the whole page in one cursor batch
+        projection = {"_id": 0, "id": 1, "user_id": 1, "description": 1,
+                      "status": 1, "created_at": 1, "updated_at": 1}
+        designs = await (db.designs.find(query, projection)
+                         .sort("created_at", -1)
+                         .limit(limit)
+                         .batch_size(limit)
+                         .to_list(limit))
+
+        return [DesignSummary(**d) for d in designs]
         
     except Exception as e:
         logger.error(f"Error listing designs: {str(e)}")
@@ -191,12 +262,12 @@ async def edit_design(design_id: str, request: ParametricEditRequest):
     """Edit design parametrically"""
     try:
         # Get existing design
-        design = await db.designs.find_one({"id": design_id}, {"_id": 0})
+        design = await _load_design(design_id)
         if not design:
             raise HTTPException(status_code=404, detail="Design not found")
-        
+
         # Parse edit description
-        edit_prompt = f"""Current design parameters: {json.dumps(design['parameters'])}
+        edit_prompt = f"""Current design parameters: {orjson.dumps(design['parameters']).decode()}
 
 User requested edit: {request.edit_description}
 
@@ -204,8 +275,8 @@ Update the parameters JSON to reflect the requested changes. Output ONLY the upd
         
         updated_params = await nlp_parser.parse(edit_prompt)
         
-        # Regenerate with updated params
-        workplane = cad_gen.generate_custom(updated_params.get('primary_geometry', {}))
+        # Regenerate with updated params (off the event loop)
+        workplane = await asyncio.to_thread(cad_gen.generate_custom, updated_params.get('primary_geometry', {}))
         bounding_box = cad_gen.get_bounding_box(workplane)
         dfm_result = dfm_validator.validate(updated_params)
         cost_result = cost_estimator.estimate_cost(updated_params, bounding_box, quantity=100)
@@ -219,11 +290,12 @@ Update the parameters JSON to reflect the requested changes. Output ONLY the upd
                     "bounding_box": bounding_box,
                     "dfm_validation": dfm_result,
                     "cost_estimate": cost_result,
-                    "updated_at": datetime.now(timezone.utc).isoformat()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
-        
+        _design_cache.pop(design_id, None)
+
         return {
             "success": True,
             "design_id": design_id,
@@ -240,18 +312,19 @@ Update the parameters JSON to reflect the requested changes. Output ONLY the upd
 async def validate_design(design_id: str):
     """Run DFM validation on design"""
     try:
-        design = await db.designs.find_one({"id": design_id}, {"_id": 0})
+        design = await _load_design(design_id)
         if not design:
             raise HTTPException(status_code=404, detail="Design not found")
-        
+
         dfm_result = dfm_validator.validate(design['parameters'])
-        
+
         # Update design
         await db.designs.update_one(
             {"id": design_id},
             {"$set": {"dfm_validation": dfm_result}}
         )
-        
+        _design_cache.pop(design_id, None)
+
         return dfm_result
         
     except Exception as e:
@@ -262,7 +335,7 @@ async def validate_design(design_id: str):
 async def estimate_cost(design_id: str, quantity: int = 100):
     """Estimate manufacturing cost"""
     try:
-        design = await db.designs.find_one({"id": design_id}, {"_id": 0})
+        design = await _load_design(design_id)
         if not design:
             raise HTTPException(status_code=404, detail="Design not found")
         
@@ -289,32 +362,42 @@ async def estimate_cost(design_id: str, quantity: int = 100):
 async def export_design(design_id: str, format: str = "step"):
     """Export design to STEP/STL/DXF"""
     try:
-        design = await db.designs.find_one({"id": design_id}, {"_id": 0})
+        design = await _load_design(design_id)
         if not design:
             raise HTTPException(status_code=404, detail="Design not found")
         
-        # Regenerate CAD model
         params = design['parameters']
-        workplane = cad_gen.generate_custom(params.get('primary_geometry', {}))
-        
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        filename = f"vibecad_{design_id}.{format.lower()}"
-        filepath = os.path.join(temp_dir, filename)
-        
-        # Export based on format
-        if format.lower() == "step" or format.lower() == "stp":
-            success = cad_gen.export_step(workplane, filepath)
-        elif format.lower() == "stl":
-            success = cad_gen.export_stl(workplane, filepath)
-        else:
+        fmt = format.lower()
+        if fmt not in ("step", "stp", "stl"):
             raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Export failed")
+
+        # Exports are deterministic in the parameters, so key the cached
+        # file by a hash of their canonical serialization: a repeat export
+        # of unchanged params is a stat + stream, no regeneration
+        params_hash = hashlib.sha256(
+            orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)
+        ).hexdigest()[:16]
+        temp_dir = tempfile.gettempdir()
+        filename = f"vibecad_{design_id}.{fmt}"
+        filepath = os.path.join(temp_dir, f"vibecad_{params_hash}.{fmt}")
+
+        # One generator run per hash even under concurrent requests
+        async with _export_locks[params_hash]:
+            if not os.path.exists(filepath):
+                # Generation and file writing are blocking CPU/IO work;
+                # keep them off the event loop
+                workplane = await asyncio.to_thread(cad_gen.generate_custom, params.get('primary_geometry', {}))
+
+                if fmt == "step" or fmt == "stp":
+                    success = await asyncio.to_thread(cad_gen.export_step, workplane, filepath)
+                else:
+                    success = await asyncio.to_thread(cad_gen.export_stl, workplane, filepath)
+
+                if not success:
+                    raise HTTPException(status_code=500, detail="Export failed")
         
         # Return file
-        return FileResponse(
+        return ExportFileResponse(
             path=filepath,
             filename=filename,
             media_type="application/octet-stream"
@@ -374,9 +457,10 @@ async def delete_design(design_id: str):
     """Delete a design"""
     try:
         result = await db.designs.delete_one({"id": design_id})
+        _design_cache.pop(design_id, None)
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Design not found")
-        
+
         return {"success": True, "message": "Design deleted"}
     except Exception as e:
         logger.error(f"Error deleting design: {str(e)}")
@@ -393,6 +477,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_db_indexes():
+    # Every endpoint looks designs up by the UUID id field, and the list
+    # view filters by user_id sorted by created_at; without these indexes
+    # both degrade to collection scans as the collection grows
+    await db.designs.create_index("id", unique=True)
+    await db.designs.create_index([("user_id", 1), ("created_at", -1)])
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()